@@ -0,0 +1,127 @@
+# BridgeNode.py
+
+import threading
+import logging
+from RingNode import RingNode
+from MultiRingNode import MultiRingNode
+
+class BridgeNode(MultiRingNode):
+    """
+    Ponte com aprendizado entre dois ou mais anéis.
+
+    Participa de cada anel com um RingNode próprio (um socket por anel) e
+    aprende em qual anel está cada apelido a partir do campo de origem dos
+    pacotes observados. Pacotes cujo destino está em outro anel ficam retidos
+    enquanto a ponte os entrega no anel de destino (mantendo a origem
+    original); o resultado (ACK, NAK ou maquinanaoexiste) é então devolvido
+    ao anel de origem. Broadcasts são repassados a todos os outros anéis.
+
+    A topologia entre anéis deve ser uma árvore (sem ciclos de pontes).
+    """
+
+    input_prompt = "Ponte pronta para comandos"
+
+    def __init__(self, ring_configs, capture=None):
+        # Cria um nó por anel, sem leitura própria do terminal (a entrada é tratada aqui)
+        self.rings = [RingNode(config_file, port, interactive=False, capture=capture) for config_file, port in ring_configs]
+        self.nickname = self.rings[0].nickname
+
+        # Tabela de aprendizado: apelido -> anel (RingNode) onde ele foi visto
+        self.table = {}
+        self.table_lock = threading.Lock()
+
+        for ring in self.rings:
+            ring.bridge = self
+
+        # Flag que indica se o nó está rodando (para controle das threads)
+        self.running = True
+
+        threading.Thread(target=self.user_input_handler, daemon=True).start()  # Thread que escuta comandos do usuário
+
+    def ring_name(self, ring):
+        return f"{ring.nickname}@{ring.port}"
+
+    def learn(self, ring, origem):
+        # Registra (ou atualiza) o anel onde a origem foi vista
+        with self.table_lock:
+            if origem in (r.nickname for r in self.rings) or self.table.get(origem) is ring:
+                return
+            self.table[origem] = ring
+        logging.info(f"📚 [{self.nickname}] Ponte aprendeu {origem} no anel {self.ring_name(ring)}")
+
+    def is_remote_source(self, ring, origem):
+        # Pacotes com origem em outro anel só circulam neste anel porque a ponte os injetou
+        with self.table_lock:
+            known = self.table.get(origem)
+        return known is not None and known is not ring
+
+    def forward(self, ring, data_packet):
+        """
+        Repassa um pacote observado em 'ring' aos outros anéis, se necessário.
+        Retorna True se o pacote ficou retido pela ponte (não deve seguir no anel).
+        """
+        origem = data_packet['src_nick']
+        destino = data_packet['dest_nick']
+        mensagem = data_packet['message']
+
+        # Broadcast: entrega uma cópia em cada um dos outros anéis, sem reter o original
+        if destino == "TODOS":
+            for other in self.rings:
+                if other is not ring:
+                    other.enqueue_message({'dest': destino, 'content': mensagem, 'attempts': 0, 'src': origem})
+            return False
+
+        with self.table_lock:
+            target = self.table.get(destino)
+
+        # Destino desconhecido ou no próprio anel: o pacote segue normalmente
+        if target is None or target is ring:
+            return False
+
+        # A ponte valida o CRC como faria o destino, para não propagar pacotes corrompidos
+        if not ring.crc_ok(data_packet):
+            logging.info(f"🌉 [{self.nickname}] Falha no CRC do pacote {origem}->{destino}. Devolvendo NAK.")
+            ring.reply(data_packet, "NAK")
+            return True
+
+        def on_done(msg, status):
+            # Devolve ao anel de origem o resultado obtido no anel de destino; status internos do nó
+            # ("descartada", "filacheia") não existem no protocolo e voltam como NAK
+            if status not in ("ACK", "NAK", "maquinanaoexiste"):
+                status = "NAK"
+            logging.info(f"🌉 [{self.nickname}] Resultado {status} para {origem}->{destino} devolvido ao anel {self.ring_name(ring)}")
+            ring.reply(data_packet, status)
+
+        logging.info(f"🌉 [{self.nickname}] Repassando {origem}->{destino} do anel {self.ring_name(ring)} para {self.ring_name(target)}")
+        ok = target.enqueue_message({'dest': destino, 'content': mensagem, 'attempts': 0, 'src': origem, 'on_done': on_done})
+        if not ok:
+            # Fila do anel de destino cheia: a origem poderá retransmitir
+            ring.reply(data_packet, "NAK")
+        return True
+
+    def enqueue_message(self, message):
+        # Mensagens da própria ponte vão para o anel onde o destino foi aprendido (ou para o primeiro anel)
+        with self.table_lock:
+            ring = self.table.get(message['dest'], self.rings[0])
+        return ring.enqueue_message(message)
+
+    def handle_command(self, line):
+        # Comando próprio da ponte: mostra a tabela de aprendizado
+        if line == "/tabela":
+            with self.table_lock:
+                linhas = [f"[{self.nickname}] Tabela da ponte:"]
+                for apelido, ring in sorted(self.table.items()):
+                    linhas.append(f"  {apelido} -> anel {self.ring_name(ring)}")
+            return "\n".join(linhas)
+
+        # Demais comandos de controle são aplicados a todos os anéis
+        return super().handle_command(line)
+
+    def status(self):
+        with self.table_lock:
+            tabela = {apelido: self.ring_name(ring) for apelido, ring in self.table.items()}
+        return {
+            'apelido': self.nickname,
+            'aneis': {self.ring_name(ring): ring.status() for ring in self.rings},
+            'tabela': tabela,
+        }
@@ -0,0 +1,71 @@
+# CommandInput.py
+
+import select
+import sys
+
+class CommandInput:
+    """
+    Leitura dos comandos digitados no terminal, comum a RingNode, DualRingNode e BridgeNode.
+
+    A classe que herda deve fornecer nickname, running, handle_command(line)
+    (retorna o texto de saída, None se a linha não for um comando conhecido,
+    ou lança ValueError se os argumentos forem inválidos)
+    e enqueue_message(message). O texto inicial vem de input_prompt.
+    """
+
+    input_prompt = "Pronto para comandos"
+
+    def user_input_handler(self):
+        # Exibe mensagem inicial para indicar que o nó está pronto para receber comandos
+        print(f"\n[{self.nickname}] {self.input_prompt} (<destino> <mensagem>):")
+
+        # Loop para escutar continuamente os comandos do usuário enquanto o nó estiver ativo
+        while self.running:
+            try:
+                # Aguarda até 1 segundo por entrada do usuário sem bloquear o restante do programa
+                ready, _, _ = select.select([sys.stdin], [], [], 1.0)
+
+                # Se houver entrada disponível do usuário
+                if ready:
+                    # Lê a linha digitada pelo usuário e remove espaços em branco adicionais
+                    line = sys.stdin.readline().strip()
+
+                    # Ignora linhas vazias
+                    if not line:
+                        continue
+
+                    # Comandos de controle (/forcartoken, /tempo, /mostrafila, ...)
+                    if line.startswith("/"):
+                        try:
+                            saida = self.handle_command(line)
+                        except ValueError as e:
+                            print(f"[{self.nickname}] {e}")
+                            continue
+                        if saida is None:
+                            print(f"[{self.nickname}] Comando desconhecido: {line}")
+                        elif saida:
+                            print(saida)
+                        continue
+
+                    # Divide a linha em duas partes: destino e mensagem
+                    parts = line.split(' ', 1)
+
+                    # Valida se a entrada contém ao menos duas partes (destinatário e mensagem)
+                    if len(parts) < 2:
+                        print(f"[{self.nickname}] Comando inválido. Use: <destino> <mensagem>")
+                        continue
+
+                    # Extrai destinatário e mensagem digitados pelo usuário
+                    dest, msg = parts[0], parts[1]
+
+                    # Enfileira a mensagem (e inicia o envio se possuir o token)
+                    ok = self.enqueue_message({'dest': dest, 'content': msg, 'attempts': 0})
+
+                    # Se a fila estiver cheia, informa o usuário
+                    if not ok:
+                        print(f"[{self.nickname}] Fila cheia. Não foi possível enfileirar.")
+
+            except Exception as e:
+                # Trata e exibe erros inesperados durante a leitura de entrada do usuário
+                if self.running:
+                    print(f"[{self.nickname}] Erro no input do usuário: {e}")
@@ -0,0 +1,128 @@
+# ControlServer.py
+
+import socket
+import sys
+import threading
+import json
+import logging
+
+class ControlServer:
+    """
+    Interface de controle local (TCP em 127.0.0.1) para automação.
+
+    Protocolo por linhas: cada linha não vazia recebida gera exatamente uma
+    linha de resposta em JSON, na mesma ordem (o cliente pode enviar várias
+    linhas sem esperar as respostas).
+
+      • "<destino> <mensagem>"   → enfileira a mensagem
+                                    {"ok": true} ou {"ok": false, "erro": "fila cheia"}
+      • "/status"                → {"ok": true, "status": {...}}
+      • "/<comando> [args]"      → mesmos comandos do terminal (/forcartoken, /tempo 2, /mostrafila, ...)
+                                    {"ok": true, "saida": "<texto>"}
+                                    ou {"ok": false, "erro": ...} (comando desconhecido ou argumento inválido)
+      • {"enviar": [{"destino": ..., "mensagem": ...}, ...]}
+                                 → envio em lote {"ok": true, "aceitas": N, "recusadas": M}
+                                    (um item sem destino ou mensagem recusa o lote inteiro, sem enfileirar nada)
+
+    Funciona com qualquer nó que ofereça enqueue_message(), handle_command() e
+    status() (RingNode, DualRingNode ou BridgeNode).
+    """
+
+    def __init__(self, node, port):
+        self.node = node
+        self.port = int(port)
+        self.running = True
+
+        # Serializa as submissões de todos os clientes (cada cliente tem sua própria thread);
+        # um lote também entra na fila sem se intercalar com mensagens de outros clientes
+        self.submit_lock = threading.Lock()
+
+        # Aceita conexões apenas da própria máquina
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.server_socket.bind(('127.0.0.1', self.port))
+            self.server_socket.listen()
+        except Exception as e:
+            print(f"[{self.node.nickname}] Erro ao abrir interface de controle na porta {self.port}: {e}")
+            sys.exit(1)
+
+        print(f"[{self.node.nickname}] Interface de controle em 127.0.0.1:{self.port}")
+        threading.Thread(target=self.accept_connections, daemon=True).start()
+
+    def accept_connections(self):
+        while self.running:
+            try:
+                conn, addr = self.server_socket.accept()
+            except OSError:
+                # Socket fechado durante o encerramento
+                break
+            logging.info(f"🎛️ [{self.node.nickname}] Cliente de controle conectado: {addr}")
+            threading.Thread(target=self.handle_client, args=(conn,), daemon=True).start()
+
+    def handle_client(self, conn):
+        with conn, conn.makefile('r', encoding='utf-8') as reader, conn.makefile('w', encoding='utf-8') as writer:
+            try:
+                for line in reader:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    writer.write(json.dumps(self.execute(line), ensure_ascii=False) + "\n")
+                    writer.flush()
+            except (OSError, ValueError):
+                # Cliente desconectou no meio da conversa
+                pass
+
+    def execute(self, line):
+        try:
+            if line == "/status":
+                return {'ok': True, 'status': self.node.status()}
+
+            if line.startswith("/"):
+                # handle_command lança ValueError para argumentos inválidos (tratado abaixo como erro)
+                saida = self.node.handle_command(line)
+                if saida is None:
+                    return {'ok': False, 'erro': f"comando desconhecido: {line}"}
+                return {'ok': True, 'saida': saida}
+
+            if line.startswith("{"):
+                return self.execute_batch(json.loads(line))
+
+            parts = line.split(' ', 1)
+            if len(parts) < 2:
+                return {'ok': False, 'erro': "use: <destino> <mensagem>"}
+            with self.submit_lock:
+                ok = self.node.enqueue_message({'dest': parts[0], 'content': parts[1], 'attempts': 0})
+            if not ok:
+                return {'ok': False, 'erro': "fila cheia"}
+            return {'ok': True}
+
+        except Exception as e:
+            return {'ok': False, 'erro': str(e)}
+
+    def execute_batch(self, request):
+        mensagens = request.get('enviar')
+        if not isinstance(mensagens, list):
+            return {'ok': False, 'erro': "esperado {\"enviar\": [{\"destino\": ..., \"mensagem\": ...}, ...]}"}
+
+        # Valida o lote inteiro antes de enfileirar: um item inválido recusa o lote todo
+        for i, item in enumerate(mensagens):
+            if (not isinstance(item, dict)
+                    or not isinstance(item.get('destino'), str) or not item['destino'].strip()
+                    or not isinstance(item.get('mensagem'), str) or not item['mensagem'].strip()):
+                return {'ok': False, 'erro': f"item {i} inválido: use {{\"destino\": ..., \"mensagem\": ...}}",
+                        'aceitas': 0, 'recusadas': len(mensagens)}
+
+        aceitas = 0
+        with self.submit_lock:
+            for item in mensagens:
+                if self.node.enqueue_message({'dest': item['destino'], 'content': item['mensagem'], 'attempts': 0}):
+                    aceitas += 1
+        return {'ok': True, 'aceitas': aceitas, 'recusadas': len(mensagens) - aceitas}
+
+    def shutdown(self):
+        self.running = False
+        try:
+            self.server_socket.close()
+        except Exception as e:
+            print(f"[{self.node.nickname}] Erro ao fechar interface de controle: {e}")
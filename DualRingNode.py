@@ -0,0 +1,96 @@
+# DualRingNode.py
+
+import threading
+import time
+import sys
+import logging
+from RingNode import RingNode
+from MultiRingNode import MultiRingNode
+
+class DualRingNode(MultiRingNode):
+    """
+    Nó de anel duplo em sentidos opostos (estilo FDDI).
+
+    Combina dois RingNode com o mesmo apelido: o anel primário (vizinho direito)
+    e o anel secundário (vizinho no sentido contrário), cada um com socket,
+    token e fila próprios. As mensagens são distribuídas entre os dois anéis e,
+    se um deles falhar (token perdido ou resposta que não volta), o tráfego
+    pendente é desviado para o outro até que o anel volte a fechar a volta.
+    """
+
+    input_prompt = "Pronto para comandos em anel duplo"
+
+    def __init__(self, primary_config, primary_port, secondary_config, secondary_port, capture=None):
+        # Cria os dois anéis sem leitura própria do terminal (a entrada é tratada aqui)
+        self.primary = RingNode(primary_config, primary_port, interactive=False, capture=capture)
+        self.secondary = RingNode(secondary_config, secondary_port, interactive=False, capture=capture)
+
+        # Os dois anéis precisam identificar a mesma máquina
+        if self.primary.nickname != self.secondary.nickname:
+            print(f"[{self.primary.nickname}] Apelido do anel secundário ({self.secondary.nickname}) difere do primário.")
+            sys.exit(1)
+
+        self.nickname = self.primary.nickname
+        self.rings = [self.primary, self.secondary]
+        self.ring_names = {self.primary: "primário", self.secondary: "secundário"}
+
+        # Flag que indica se o nó está rodando (para controle das threads)
+        self.running = True
+
+        threading.Thread(target=self.failover_monitor, daemon=True).start()  # Thread que desvia o tráfego de um anel com falha
+        threading.Thread(target=self.user_input_handler, daemon=True).start() # Thread que escuta comandos do usuário
+
+    def ring_name(self, ring):
+        return self.ring_names[ring]
+
+    def choose_ring(self):
+        # Considera apenas anéis operacionais (se nenhum estiver, usa o primário)
+        candidates = [ring for ring in self.rings if ring.ring_ok] or [self.primary]
+
+        # Escolhe o anel menos carregado (fila + mensagem em trânsito); empate favorece o primário
+        return min(candidates, key=lambda ring: ring.message_queue.size() + (1 if ring.waiting_for_answer else 0))
+
+    def enqueue_message(self, message):
+        ring = self.choose_ring()
+        logging.info(f"🔀 [{self.nickname}] Mensagem para {message['dest']} direcionada ao anel {self.ring_name(ring)}")
+        return ring.enqueue_message(message)
+
+    def status(self):
+        return {
+            'apelido': self.nickname,
+            'aneis': {self.ring_name(ring): ring.status() for ring in self.rings},
+        }
+
+    def failover_monitor(self):
+        # Lembra o último estado conhecido de cada anel para registrar transições
+        last_state = {ring: True for ring in self.rings}
+
+        while self.running:
+            time.sleep(1)
+
+            for ring in self.rings:
+                other = self.secondary if ring is self.primary else self.primary
+
+                if ring.ring_ok != last_state[ring]:
+                    last_state[ring] = ring.ring_ok
+                    if ring.ring_ok:
+                        logging.info(f"✅ [{self.nickname}] Anel {self.ring_name(ring)} recuperado.")
+                    else:
+                        logging.info(f"🔁 [{self.nickname}] Anel {self.ring_name(ring)} com falha — desviando tráfego para o anel {self.ring_name(other)}.")
+
+                # Só desvia se o outro anel estiver operacional
+                if ring.ring_ok or not other.ring_ok:
+                    continue
+
+                # Move toda a fila, inclusive a mensagem em trânsito (uma resposta tardia no anel com falha
+                # não corresponde mais ao topo da fila e é ignorada)
+                with ring.state_lock:
+                    ring.waiting_for_answer = False
+                    pendentes = []
+                    while not ring.message_queue.is_empty():
+                        pendentes.append(ring.message_queue.dequeue())
+
+                for msg in pendentes:
+                    if not other.enqueue_message(msg):
+                        logging.info(f"❌ [{self.nickname}] Fila do anel {self.ring_name(other)} cheia. Mensagem para {msg['dest']} descartada.")
+                        ring.finish_message(msg, "descartada")
@@ -0,0 +1,41 @@
+# MultiRingNode.py
+
+import asyncio
+from RingNode import RingNode
+from CommandInput import CommandInput
+
+class MultiRingNode(CommandInput):
+    """
+    Base dos nós que participam de vários anéis (DualRingNode e BridgeNode).
+
+    Cada anel é um RingNode em self.rings; a subclasse decide em qual anel cada
+    mensagem entra (enqueue_message) e como o anel é identificado (ring_name).
+    Aqui ficam a API de envio, os comandos de controle aplicados a todos os
+    anéis, a leitura do terminal e o encerramento.
+    """
+
+    def send(self, dest, content):
+        # Enfileira a mensagem e retorna um Future com o resultado da entrega (ver RingNode.tracked_message)
+        message, future = RingNode.tracked_message(dest, content)
+        if not self.enqueue_message(message):
+            self.rings[0].finish_message(message, "filacheia")
+        return future
+
+    async def send_async(self, dest, content):
+        return await asyncio.wrap_future(self.send(dest, content))
+
+    def handle_command(self, line):
+        # Comandos de controle são aplicados a todos os anéis; retorna None se nenhum anel reconhecer o comando
+        saidas = []
+        handled = False
+        for ring in self.rings:
+            saida = ring.handle_command(line)
+            if saida is not None:
+                handled = True
+                saidas.append(f"[{self.nickname}] Anel {self.ring_name(ring)}:" + (f"\n{saida}" if saida else ""))
+        return "\n".join(saidas) if handled else None
+
+    def shutdown(self):
+        self.running = False
+        for ring in self.rings:
+            ring.shutdown()
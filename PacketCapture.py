@@ -0,0 +1,133 @@
+# PacketCapture.py
+
+import queue
+import socket
+import struct
+import threading
+import time
+
+class PacketCapture:
+    """
+    Captura dos quadros enviados/recebidos em arquivo pcap (abre no Wireshark).
+
+    Cada quadro UDP é gravado com cabeçalhos IPv4/UDP sintéticos (LINKTYPE_RAW),
+    então filtros como "udp.port == 6001" funcionam normalmente. A gravação é
+    feita por uma thread em segundo plano: record() apenas enfileira o quadro,
+    sem bloquear as threads do nó com E/S de disco.
+    """
+
+    LINKTYPE_RAW = 101     # Pacotes IPv4 sem cabeçalho de enlace
+    SNAPLEN = 65535
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+        self.addresses = {}  # cache de host -> 4 bytes do IPv4
+
+        # Arquivo com buffer; o cabeçalho global é gravado imediatamente
+        self.file = open(path, 'wb')
+        self.file.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, self.SNAPLEN, self.LINKTYPE_RAW))
+
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def record(self, data, src, dst):
+        """
+        Registra um quadro UDP (bytes) enviado de src para dst (tuplas (ip, porta)).
+        """
+        self.pending.put((time.time(), data, src, dst))
+
+    def write_loop(self):
+        last_flush = time.time()
+        while True:
+            try:
+                item = self.pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = False
+
+            # None sinaliza encerramento
+            if item is None:
+                break
+            if item:
+                self.write_record(*item)
+
+            # Descarrega o buffer periodicamente (ou quando não há quadros chegando)
+            if item is False or time.time() - last_flush >= self.flush_interval:
+                self.file.flush()
+                last_flush = time.time()
+
+        self.file.flush()
+        self.file.close()
+
+    def write_record(self, timestamp, data, src, dst):
+        udp_length = 8 + len(data)
+        total_length = 20 + udp_length
+
+        ip_header = struct.pack('!BBHHHBBH4s4s', 0x45, 0, total_length, 0, 0, 64, socket.IPPROTO_UDP, 0,
+                                self.ip_bytes(src[0]), self.ip_bytes(dst[0]))
+        ip_header = ip_header[:10] + struct.pack('!H', self.ip_checksum(ip_header)) + ip_header[12:]
+
+        # Checksum UDP 0 = não calculado (permitido em IPv4)
+        udp_header = struct.pack('!HHHH', src[1], dst[1], udp_length, 0)
+
+        frame = ip_header + udp_header + data
+        seconds = int(timestamp)
+        micros = int((timestamp - seconds) * 1_000_000)
+        self.file.write(struct.pack('<IIII', seconds, micros, len(frame), len(frame)))
+        self.file.write(frame)
+
+    def ip_bytes(self, host):
+        if host not in self.addresses:
+            try:
+                self.addresses[host] = socket.inet_aton(socket.gethostbyname(host))
+            except OSError:
+                self.addresses[host] = socket.inet_aton('0.0.0.0')
+        return self.addresses[host]
+
+    @staticmethod
+    def ip_checksum(header):
+        total = sum(struct.unpack('!10H', header))
+        while total >> 16:
+            total = (total & 0xffff) + (total >> 16)
+        return ~total & 0xffff
+
+    def close(self):
+        # Grava o que ainda estiver pendente e fecha o arquivo
+        self.pending.put(None)
+        self.writer.join()
+
+    @staticmethod
+    def read(path):
+        """
+        Lê um arquivo pcap gravado por PacketCapture.
+        Retorna uma lista de (timestamp, (ip_origem, porta_origem), (ip_destino, porta_destino), dados).
+        """
+        frames = []
+        with open(path, 'rb') as f:
+            header = f.read(24)
+            magic, _, _, _, _, _, linktype = struct.unpack('<IHHiIII', header)
+            if magic != 0xa1b2c3d4 or linktype != PacketCapture.LINKTYPE_RAW:
+                raise ValueError("Arquivo pcap não suportado (esperado LINKTYPE_RAW gravado por PacketCapture)")
+
+            while True:
+                record_header = f.read(16)
+                if len(record_header) < 16:
+                    if record_header:
+                        print(f"[PacketCapture] Cabeçalho de registro truncado no fim de {path}. Leitura interrompida.")
+                    break
+                seconds, micros, captured, _ = struct.unpack('<IIII', record_header)
+                frame = f.read(captured)
+
+                # Arquivo truncado (ex.: gravação interrompida): o último registro está incompleto
+                if len(frame) < captured:
+                    print(f"[PacketCapture] Registro truncado no fim de {path} ({len(frame)} de {captured} bytes). Leitura interrompida.")
+                    break
+
+                header_length = (frame[0] & 0x0f) * 4
+                src_ip = socket.inet_ntoa(frame[12:16])
+                dst_ip = socket.inet_ntoa(frame[16:20])
+                src_port, dst_port = struct.unpack('!HH', frame[header_length:header_length + 4])
+                data = frame[header_length + 8:]
+                frames.append((seconds + micros / 1_000_000, (src_ip, src_port), (dst_ip, dst_port), data))
+        return frames
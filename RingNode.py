@@ -1,19 +1,25 @@
 import socket
 import threading
 import time
-import select
 import sys
 import random
 import logging
+import asyncio
+from concurrent.futures import Future
 from MessageQueue import MessageQueue
 from Packet import Packet
 from CRC32 import CRC32
 from ErrorInserter import ErrorInserter
+from CommandInput import CommandInput
 
-class RingNode:
-    def __init__(self, config_file):
+class RingNode(CommandInput):
+    # Status exclusivo da sonda de recuperação (mensagens comuns só circulam com
+    # "maquinanaoexiste", "ACK" ou "NAK"), para não confundi-la com mensagens que o nó envia a si mesmo
+    PROBE_STATUS = "sonda"
+
+    def __init__(self, config_file, port=None, interactive=True, capture=None, offline=False):
         # Carrega configurações do nó a partir de um arquivo externo
-        self.load_config(config_file)
+        self.load_config(config_file, port)
 
         # Inicializa a fila de mensagens pendentes (limite máximo de 10)
         self.message_queue = MessageQueue(max_size=10)
@@ -37,6 +43,23 @@ class RingNode:
         # Indica se o nó está aguardando resposta (ACK ou NAK) de mensagem enviada
         self.waiting_for_answer = False
 
+        # Protege o estado do token, 'waiting_for_answer' e o topo da fila entre as threads
+        # (recepção, monitor, terminal, interface de controle e chamadas de send())
+        self.state_lock = threading.RLock()
+
+        # Indica se o anel está operacional: falso após perda do token ou de uma resposta (ACK/NAK);
+        # volta a verdadeiro só quando uma sonda enviada logo atrás do próprio token completa a volta
+        self.ring_ok = True
+
+        # Momento do último envio de dados (para detectar resposta que nunca chegou)
+        self.last_data_sent_time = None
+
+        # Ponte (BridgeNode) da qual este anel faz parte, se houver
+        self.bridge = None
+
+        # Captura de quadros em pcap (PacketCapture), se habilitada
+        self.capture = capture
+
         # Configuração do sistema de logs (salvos em arquivo específico do nó)
         logging.basicConfig(
             filename=f"{self.nickname}.log",
@@ -48,6 +71,10 @@ class RingNode:
         # Cria o socket UDP para comunicação na rede em anel
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
+        # Modo offline (reprodução de capturas): não ouve a rede nem inicia as threads
+        if offline:
+            return
+
         # Vincula (bind) o socket à porta especificada (tenta ouvir na porta configurada)
         try:
             self.socket.bind(('0.0.0.0', self.port))
@@ -60,9 +87,12 @@ class RingNode:
         threading.Thread(target=self.generate_initial_token, daemon=True).start()  # Thread que gera token inicial se configurado
         threading.Thread(target=self.receive_packets, daemon=True).start()        # Thread que recebe e processa pacotes continuamente
         threading.Thread(target=self.token_monitor, daemon=True).start()          # Thread que monitora se o token foi perdido
-        threading.Thread(target=self.user_input_handler, daemon=True).start()     # Thread que escuta comandos do usuário para envio de mensagens
 
-    def load_config(self, config_file):
+        # Nós controlados por outro objeto (ex.: DualRingNode) não leem o terminal diretamente
+        if interactive:
+            threading.Thread(target=self.user_input_handler, daemon=True).start() # Thread que escuta comandos do usuário para envio de mensagens
+
+    def load_config(self, config_file, port=None):
         try:
             # Abre o arquivo de configuração para leitura
             with open(config_file, 'r') as f:
@@ -86,13 +116,15 @@ class RingNode:
                 # Determina se este nó será responsável por gerar o token inicial
                 self.generate_token = lines[3].lower() == 'true'
 
-                # Verifica se o usuário forneceu a porta local como argumento via linha de comando
-                if len(sys.argv) < 3:
-                    print("Uso: python3 ring_network.py <arquivo_config> <minha_porta>")
-                    sys.exit(1)
+                # Sem porta explícita, usa a porta local fornecida como argumento via linha de comando
+                if port is None:
+                    if len(sys.argv) < 3:
+                        print("Uso: python3 ring_network.py <arquivo_config> <minha_porta>")
+                        sys.exit(1)
+                    port = sys.argv[2]
 
-                # Atribui a porta local fornecida como argumento do sistema
-                self.port = int(sys.argv[2])
+                # Atribui a porta local onde o nó fará bind
+                self.port = int(port)
 
                 # Exibe as configurações carregadas no console para validação
                 print(f"[{self.nickname}] Configuração carregada:")
@@ -112,14 +144,15 @@ class RingNode:
             # Espera 1 segundo para garantir que todos os nós estejam prontos na rede antes de gerar o token
             time.sleep(1.0)
 
-            # Marca o nó como possuidor atual do token
-            self.token_holder = True
+            with self.state_lock:
+                # Marca o nó como possuidor atual do token
+                self.token_holder = True
 
-            # Registra no log que o token inicial está sendo gerado
-            logging.info(f"🛠️ [{self.nickname}] Gerando token inicial...")
+                # Registra no log que o token inicial está sendo gerado
+                logging.info(f"🛠️ [{self.nickname}] Gerando token inicial...")
 
-            # Chama a função que envia o token ao próximo nó
-            self.send_token()
+                # Chama a função que envia o token ao próximo nó
+                self.send_token()
 
     def send_token(self):
         try:
@@ -130,7 +163,7 @@ class RingNode:
             encoded_token_payload = Packet.encode(token_payload).encode('utf-8')
 
             # Envia o token para o próximo nó na rede (vizinho direito)
-            self.socket.sendto(encoded_token_payload, self.right_neighbor)
+            self.send_raw(encoded_token_payload, self.right_neighbor)
 
             # Atualiza o registro do tempo atual como o momento em que o token foi enviado
             current_time = time.time()
@@ -141,6 +174,10 @@ class RingNode:
             logging.info(f"🔄 [{self.nickname}] Enviou TOKEN para {self.right_neighbor}")
             logging.info(f"🚚 Token agora em trânsito para {self.right_neighbor}")
 
+            # Com o anel em falha, envia uma sonda logo atrás do token: se ela voltar, o próprio token deu a volta completa
+            if not self.ring_ok:
+                self.send_probe()
+
             # Marca que o nó não possui mais o token após enviá-lo
             self.token_holder = False
 
@@ -155,16 +192,11 @@ class RingNode:
                 # Recebe um pacote UDP (até 4096 bytes)
                 data, addr = self.socket.recvfrom(4096)
 
-                # Decodifica os dados recebidos para string UTF-8
-                payload_str = data.decode('utf-8')
-
-                # Verifica se o pacote recebido é o token (comparação direta)
-                if payload_str == Packet.encode(Packet.create_token()):
-                    self.handle_token_received(addr)
+                # Registra o quadro recebido na captura, se habilitada
+                if self.capture:
+                    self.capture.record(data, addr, ('127.0.0.1', self.port))
 
-                # Verifica se o pacote recebido é um pacote de dados (verifica prefixo identificador)
-                elif payload_str.startswith(Packet.encode(Packet.create_data("", "", "", ""))[0:4]):
-                    self.process_data_packet(payload_str, addr)
+                self.handle_datagram(data, addr)
 
             except socket.timeout:
                 # Ignora a exceção de timeout e continua o loop (para manter o programa ativo)
@@ -175,37 +207,77 @@ class RingNode:
                 if self.running:
                     logging.info(f"⚠️ [{self.nickname}] Erro ao receber pacote: {e}")
 
+    def handle_datagram(self, data, addr):
+        # Decodifica os dados recebidos para string UTF-8
+        payload_str = data.decode('utf-8')
+
+        # Verifica se o pacote recebido é o token (comparação direta)
+        if payload_str == Packet.encode(Packet.create_token()):
+            self.handle_token_received(addr)
+
+        # Verifica se o pacote recebido é um pacote de dados (verifica prefixo identificador)
+        elif payload_str.startswith(Packet.encode(Packet.create_data("", "", "", ""))[0:4]):
+            self.process_data_packet(payload_str, addr)
+
+    def send_raw(self, data, addr):
+        # Envia um quadro já codificado e o registra na captura, se habilitada
+        self.socket.sendto(data, addr)
+        if self.capture:
+            self.capture.record(data, ('127.0.0.1', self.port), addr)
+
     def handle_token_received(self, addr_from):
         # Armazena o momento atual do recebimento do token
         current_time = time.time()
 
-        # Verifica se este nó já possui o token (evitando duplicidade)
-        if self.token_holder:
-            logging.info(f"⚠️ [{self.nickname}] TOKEN duplicado recebido de {addr_from} — Ignorando")
-            return  # Sai do método sem realizar mais ações
-
-        # Marca o nó como possuidor atual do token
-        self.token_holder = True
-        logging.info(f"🟢 [{self.nickname}] TOKEN chegou de {addr_from} — Agora em {self.nickname}")
-
-        # Verifica o tempo transcorrido desde o envio anterior do token, caso já tenha sido enviado antes
-        if self.time_i_last_sent_token is not None:
-            elapsed = current_time - self.time_i_last_sent_token
-            if elapsed < self.min_token_time:
-                logging.info(f"⏱️ [{self.nickname}] Token retornou em {elapsed:.2f}s (esperado mínimo: {self.min_token_time}s)")
-
-        # Atualiza o último tempo registrado em que o token foi visto
-        self.last_token_time = current_time
-
-        # Verifica se há mensagens pendentes na fila e se não está aguardando resposta
-        if not self.message_queue.is_empty() and not self.waiting_for_answer:
-            # Se houver mensagem, tenta enviá-la imediatamente
-            self.send_data()
-            self.waiting_for_answer = True
-        elif self.message_queue.is_empty():
-            # Se não houver mensagem, aguarda um tempo definido e então envia o token adiante
-            time.sleep(self.token_hold_time)
-            self.send_token()
+        with self.state_lock:
+            # Verifica se este nó já possui o token (evitando duplicidade)
+            if self.token_holder:
+                logging.info(f"⚠️ [{self.nickname}] TOKEN duplicado recebido de {addr_from} — Ignorando")
+                return  # Sai do método sem realizar mais ações
+
+            # Marca o nó como possuidor atual do token
+            self.token_holder = True
+            logging.info(f"🟢 [{self.nickname}] TOKEN chegou de {addr_from} — Agora em {self.nickname}")
+
+            # Verifica o tempo transcorrido desde o envio anterior do token, caso já tenha sido enviado antes
+            if self.time_i_last_sent_token is not None:
+                elapsed = current_time - self.time_i_last_sent_token
+                if elapsed < self.min_token_time:
+                    logging.info(f"⏱️ [{self.nickname}] Token retornou em {elapsed:.2f}s (esperado mínimo: {self.min_token_time}s)")
+
+            # Atualiza o último tempo registrado em que o token foi visto
+            self.last_token_time = current_time
+
+            # Verifica se há mensagens pendentes na fila e se não está aguardando resposta
+            if not self.message_queue.is_empty() and not self.waiting_for_answer:
+                # Se houver mensagem, tenta enviá-la imediatamente
+                self.waiting_for_answer = True
+                self.send_data()
+                return
+            if not self.message_queue.is_empty():
+                return
+
+        # Se não houver mensagem, aguarda um tempo definido e então envia o token adiante
+        self.release_token()
+
+    def send_probe(self):
+        # Sonda: pacote de dados endereçado ao próprio nó (os demais apenas o repassam)
+        probe = Packet.create_data(self.nickname, self.nickname, "sonda", self.PROBE_STATUS)
+        Packet.set_crc(probe, CRC32.calculate(probe))
+        self.send_raw(Packet.encode(probe).encode('utf-8'), self.right_neighbor)
+
+    def release_token(self):
+        # Segura o token pelo tempo definido sem bloquear a fila e então o repassa,
+        # a menos que uma mensagem tenha sido enviada nesse intervalo
+        time.sleep(self.token_hold_time)
+        with self.state_lock:
+            if not self.token_holder or self.waiting_for_answer:
+                return
+            if not self.message_queue.is_empty():
+                self.waiting_for_answer = True
+                self.send_data()
+            else:
+                self.send_token()
 
     def send_data(self):
         try:
@@ -213,20 +285,26 @@ class RingNode:
             msg = self.message_queue.peek()
 
             # Se não houver mensagens para enviar, verifica se possui token para passá-lo adiante
+            # (em outra thread, para não segurar 'state_lock' durante a espera)
             if not msg:
+                self.waiting_for_answer = False
                 if self.token_holder:
-                    time.sleep(self.token_hold_time)  # Aguarda o tempo definido antes de passar o token
-                    self.send_token()  # Envia o token ao próximo nó
+                    threading.Thread(target=self.release_token, daemon=True).start()
                 return  # Encerra o método caso não haja mensagem a ser enviada
 
             # Extrai informações da mensagem pendente (destinatário, conteúdo e número de tentativas)
             dest, content, attempts = msg['dest'], msg['content'], msg['attempts']
 
+            # Registra o momento da primeira transmissão (fim da espera na fila) e conta as transmissões
+            msg.setdefault('first_sent_at', time.time())
+            msg['transmissions'] = msg.get('transmissions', 0) + 1
+
             # Define um status inicial padrão caso o destinatário não exista (será ajustado posteriormente)
             status = "maquinanaoexiste"
 
             # Cria o pacote de dados utilizando informações do remetente, destinatário e conteúdo
-            data_packet = Packet.create_data(self.nickname, dest, content, status)
+            # (mensagens repassadas por uma ponte mantêm a origem original)
+            data_packet = Packet.create_data(msg.get('src', self.nickname), dest, content, status)
 
             # Calcula o valor de checksum CRC32 para garantir integridade dos dados
             crc = CRC32.calculate(data_packet)
@@ -242,7 +320,8 @@ class RingNode:
             encoded = Packet.encode(data_packet).encode('utf-8')
 
             # Envia o pacote para o próximo nó na rede
-            self.socket.sendto(encoded, self.right_neighbor)
+            self.send_raw(encoded, self.right_neighbor)
+            self.last_data_sent_time = time.time()
 
             # Registra a tentativa de envio no log com detalhes
             logging.info(f"✉️ [{self.nickname}] Enviando para {dest} (tentativa {attempts+1}) via {self.right_neighbor}")
@@ -255,8 +334,7 @@ class RingNode:
             # Caso esteja aguardando uma resposta e possua o token, passa-o adiante após timeout
             if self.token_holder and self.waiting_for_answer:
                 self.waiting_for_answer = False
-                time.sleep(self.token_hold_time)
-                self.send_token()
+                threading.Thread(target=self.release_token, daemon=True).start()
 
     def process_data_packet(self, payload_str, addr_from):
         try:
@@ -271,90 +349,98 @@ class RingNode:
 
             logging.info(f"[{self.nickname}] Pacote recebido de {addr_from} (origem: {origem}, destino: {destino}, status: {status_atual})")
 
-            # Verifica se o pacote retornou ao remetente original (este nó)
-            if origem == self.nickname:
-                self.waiting_for_answer = False
-                
-                # Se o pacote foi um broadcast, remove imediatamente da fila ao retornar
-                if destino == "TODOS":
-                    dequeued_msg = self.message_queue.dequeue()
-                    logging.info(f"[{self.nickname}] Broadcast para TODOS completou a volta e foi removido da fila.")
-                else:
+            # Verifica se o pacote retornou ao remetente original (este nó ou, numa ponte, um nó de outro anel)
+            if origem == self.nickname or (self.bridge and self.bridge.is_remote_source(self, origem)):
+                # Sonda de recuperação completou a volta: o anel voltou a funcionar
+                # (mensagens comuns enviadas ao próprio nó seguem a resolução normal abaixo)
+                if status_atual == self.PROBE_STATUS and destino == self.nickname:
+                    if not self.ring_ok:
+                        self.ring_ok = True
+                        logging.info(f"✅ [{self.nickname}] Sonda completou a volta — anel operacional novamente.")
+                    return
+
+                finished = None
+                release = False
+
+                with self.state_lock:
+                    # Só a mensagem em trânsito (topo da fila, mesmo destino) pode ser resolvida por este retorno;
+                    # respostas duplicadas ou atrasadas não afetam a próxima mensagem da fila
+                    head = self.message_queue.peek()
+                    matches = self.waiting_for_answer and head is not None and head['dest'] == destino
+                    self.waiting_for_answer = False
+
+                    # Se o pacote foi um broadcast, remove imediatamente da fila ao retornar
+                    if destino == "TODOS":
+                        if matches:
+                            self.message_queue.dequeue()
+                            finished = (head, "broadcast")
+                            logging.info(f"[{self.nickname}] Broadcast para TODOS completou a volta e foi removido da fila.")
+                        else:
+                            logging.info(f"[{self.nickname}] Retorno de broadcast não corresponde ao topo da fila. Ignorando.")
+
                     # Se a mensagem retornada foi confirmada com sucesso (ACK)
-                    if status_atual == "ACK":
-                        dequeued_msg = self.message_queue.dequeue()
-                        logging.info(f"[{self.nickname}] Mensagem para {destino} entregue com sucesso (ACK). Removendo da fila.")
-                    
+                    elif status_atual == "ACK":
+                        if matches:
+                            self.message_queue.dequeue()
+                            finished = (head, "ACK")
+                            logging.info(f"[{self.nickname}] Mensagem para {destino} entregue com sucesso (ACK). Removendo da fila.")
+                        else:
+                            logging.info(f"[{self.nickname}] Recebido ACK para {destino}, mas não corresponde ao topo da fila.")
+
                     # Se houve falha na entrega (NAK)
                     elif status_atual == "NAK":
-                        msg_in_queue = self.message_queue.peek()
-                        if msg_in_queue and msg_in_queue['dest'] == destino:
-                            msg_in_queue['attempts'] += 1
-                            
+                        if matches:
+                            head['attempts'] += 1
+
                             # Limita a apenas uma retransmissão
-                            if msg_in_queue['attempts'] >= 2:
+                            if head['attempts'] >= 2:
                                 self.message_queue.dequeue()
+                                finished = (head, "NAK")
                                 logging.info(f"[{self.nickname}] Mensagem para {destino} falhou após 1 retransmissão. Removendo.")
                             else:
-                                logging.info(f"[{self.nickname}] Falha (NAK) para {destino}. Retransmitindo (tentativa {msg_in_queue['attempts']}).")
+                                logging.info(f"[{self.nickname}] Falha (NAK) para {destino}. Retransmitindo (tentativa {head['attempts']}).")
                         else:
                             logging.info(f"[{self.nickname}] Recebido NAK para {destino}, mas não corresponde ao topo da fila.")
 
                     # Se o destino não existe
                     elif status_atual == "maquinanaoexiste":
-                        self.message_queue.dequeue()
-                        logging.info(f"[{self.nickname}] Destino {destino} inexistente. Mensagem descartada.")
+                        if matches:
+                            self.message_queue.dequeue()
+                            finished = (head, "maquinanaoexiste")
+                            logging.info(f"[{self.nickname}] Destino {destino} inexistente. Mensagem descartada.")
+                        else:
+                            logging.info(f"[{self.nickname}] Retorno para {destino} não corresponde ao topo da fila. Ignorando.")
                     else:
                         logging.info(f"[{self.nickname}] Status desconhecido '{status_atual}' recebido.")
 
-                # Decide se há outra mensagem para enviar ou se deve passar o token
-                if self.token_holder:
-                    if not self.message_queue.is_empty():
-                        self.send_data()
-                        self.waiting_for_answer = True
-                    else:
-                        time.sleep(self.token_hold_time)
-                        self.send_token()
+                    # Decide se há outra mensagem para enviar ou se deve passar o token
+                    if self.token_holder:
+                        if not self.message_queue.is_empty():
+                            self.waiting_for_answer = True
+                            self.send_data()
+                        else:
+                            release = True
+
+                # O resultado só é notificado depois da decisão acima (quem aguarda pode enfileirar a próxima mensagem)
+                if finished:
+                    self.finish_message(*finished)
+                if release:
+                    self.release_token()
                 return
 
+            # Uma ponte aprende em qual anel está cada origem observada
+            if self.bridge:
+                self.bridge.learn(self, origem)
+
             # Se o pacote é destinado diretamente a este nó (unicast)
             if destino == self.nickname:
-                # Cria um pacote temporário para calcular CRC
-                temp_packet_for_crc = {
-                    'type': 'data',
-                    'value': data_packet['value'],
-                    'src_nick': origem,
-                    'dest_nick': destino,
-                    'error_status': status_atual,
-                    'message': mensagem
-                }
-                crc_calculado = CRC32.calculate(temp_packet_for_crc)
-                
-                # Validação do CRC recebido
-                try:
-                    crc_recebido = int(data_packet['crc'])
-                except ValueError:
-                    logging.info(f"[{self.nickname}] CRC inválido '{data_packet['crc']}'. Enviando NAK.")
-                    data_packet['error_status'] = "NAK"
-                    data_packet['crc'] = '0'
-                    new_crc = CRC32.calculate(data_packet)
-                    Packet.set_crc(data_packet, new_crc)
-                    self.socket.sendto(Packet.encode(data_packet).encode('utf-8'), self.right_neighbor)
-                    return
-
-                # Verifica CRC para confirmar integridade
-                if crc_calculado != crc_recebido:
-                    data_packet['error_status'] = "NAK"
-                    logging.info(f"[{self.nickname}] Falha no CRC (origem={origem}). Enviando NAK.")
-                else:
-                    data_packet['error_status'] = "ACK"
+                # Verifica CRC para confirmar integridade e responde com ACK ou NAK
+                if self.crc_ok(data_packet):
                     logging.info(f"[{self.nickname}] CRC válido. Mensagem de {origem}: \"{mensagem}\". Enviando ACK.")
-
-                # Recalcula CRC e encaminha o pacote ACK ou NAK
-                data_packet['crc'] = '0'
-                new_crc_for_ack = CRC32.calculate(data_packet)
-                Packet.set_crc(data_packet, new_crc_for_ack)
-                self.socket.sendto(Packet.encode(data_packet).encode('utf-8'), self.right_neighbor)
+                    self.reply(data_packet, "ACK")
+                else:
+                    logging.info(f"[{self.nickname}] Falha no CRC (origem={origem}). Enviando NAK.")
+                    self.reply(data_packet, "NAK")
                 return
 
             # Se o pacote é um broadcast (destino "TODOS")
@@ -379,24 +465,74 @@ class RingNode:
                 except ValueError:
                     logging.info(f"[{self.nickname}] Broadcast de {origem} com CRC inválido: \"{mensagem}\"")
 
+                # Uma ponte também repassa o broadcast aos demais anéis
+                if self.bridge:
+                    self.bridge.forward(self, data_packet)
+
                 # Encaminha o broadcast para o próximo nó
-                self.socket.sendto(payload_str.encode('utf-8'), self.right_neighbor)
+                self.send_raw(payload_str.encode('utf-8'), self.right_neighbor)
+                return
+
+            # Numa ponte, pacotes para nós de outro anel ficam retidos até a resposta do outro anel
+            if self.bridge and self.bridge.forward(self, data_packet):
                 return
 
             # Se o pacote não é destinado a este nó nem é broadcast, simplesmente encaminha ao próximo nó
-            self.socket.sendto(payload_str.encode('utf-8'), self.right_neighbor)
+            self.send_raw(payload_str.encode('utf-8'), self.right_neighbor)
 
         except Exception as e:
             logging.info(f"[{self.nickname}] Erro ao processar pacote: {e}. Payload: '{payload_str}'")
 
+    def crc_ok(self, data_packet):
+        # Recalcula o CRC do pacote de dados e compara com o CRC recebido
+        crc_calculado = CRC32.calculate(data_packet)
+        try:
+            return crc_calculado == int(data_packet['crc'])
+        except ValueError:
+            logging.info(f"[{self.nickname}] CRC inválido '{data_packet['crc']}'.")
+            return False
+
+    def reply(self, data_packet, status):
+        # Ajusta o status (ACK, NAK ou maquinanaoexiste), recalcula o CRC e devolve o pacote ao anel
+        data_packet['error_status'] = status
+        data_packet['crc'] = '0'
+        Packet.set_crc(data_packet, CRC32.calculate(data_packet))
+        self.send_raw(Packet.encode(data_packet).encode('utf-8'), self.right_neighbor)
+
+    def finish_message(self, msg, status):
+        # Notifica quem acompanha a mensagem (ex.: ponte) sobre o resultado final da entrega
+        if msg and msg.get('on_done'):
+            try:
+                msg['on_done'](msg, status)
+            except Exception as e:
+                logging.info(f"⚠️ [{self.nickname}] Erro ao notificar resultado da mensagem para {msg['dest']}: {e}")
+
     def token_monitor(self):
         # Monitora continuamente a presença do token na rede
         while self.running:
             # Aguarda 1 segundo antes de cada verificação
             time.sleep(1)
 
-            # Verifica se o token já foi visto antes
-            if self.last_token_time is not None:
+            # Resposta (ACK/NAK) que nunca voltou: o pacote se perdeu e o anel está com falha
+            with self.state_lock:
+                if self.waiting_for_answer and self.last_data_sent_time is not None:
+                    elapsed = time.time() - self.last_data_sent_time
+                    if elapsed > self.token_timeout:
+                        logging.info(f"⌛ [{self.nickname}] Sem resposta após {elapsed:.2f}s — anel com falha, mensagem mantida na fila.")
+                        self.ring_ok = False
+                        self.waiting_for_answer = False
+
+                        # Repassa o token (com sonda) em vez de segurá-lo indefinidamente
+                        if self.token_holder:
+                            self.send_token()
+
+            # Verifica a perda do token sob o lock: um token que chegue entre a verificação e a regeneração
+            # já pode estar sendo usado por handle_token_received (enviando dados)
+            with self.state_lock:
+                # Verifica se o token já foi visto antes
+                if self.last_token_time is None:
+                    continue
+
                 # Calcula quanto tempo se passou desde a última vez que viu o token
                 elapsed = time.time() - self.last_token_time
 
@@ -405,6 +541,9 @@ class RingNode:
                     # Registra no log que o token foi considerado perdido
                     logging.info(f"🕳️ [{self.nickname}] TOKEN perdido após {elapsed:.2f}s — Gerando novo...")
 
+                    # Marca o anel como com falha até que uma sonda enviada atrás do novo token complete a volta
+                    self.ring_ok = False
+
                     # Marca o nó como possuidor atual do token
                     self.token_holder = True
 
@@ -414,116 +553,150 @@ class RingNode:
                     # Envia o novo token gerado ao próximo nó
                     self.send_token()
 
-    def user_input_handler(self):
-        # Exibe mensagem inicial para indicar que o nó está pronto para receber comandos
-        print(f"\n[{self.nickname}] Pronto para comandos (<destino> <mensagem>):")
-        
-        # Loop para escutar continuamente os comandos do usuário enquanto o nó estiver ativo
-        while self.running:
+    def enqueue_message(self, message):
+        # Registra o momento de entrada na fila (mantido se a mensagem for movida entre filas)
+        message.setdefault('enqueued_at', time.time())
+
+        with self.state_lock:
+            # Tenta enfileirar a mensagem na fila de mensagens pendentes
+            ok = self.message_queue.enqueue(message)
+
+            # Se possuir o token e não estiver aguardando resposta, inicia envio imediatamente
+            if ok and self.token_holder and not self.waiting_for_answer:
+                print(f"[{self.nickname}] Possui token, enviando...")
+                self.waiting_for_answer = True
+                self.send_data()
+
+        return ok
+
+    @staticmethod
+    def tracked_message(dest, content):
+        """
+        Cria uma mensagem acompanhada por um Future, resolvido quando a mensagem sai da fila com:
+          {'dest', 'status', 'attempts', 'latency', 'queue_wait'}
+        status: "ACK", "NAK" (falhou após retransmissão), "maquinanaoexiste", "broadcast" (volta completa),
+                "filacheia" (não enfileirada) ou "descartada" (removida sem resposta).
+        latency: segundos entre entrar na fila e o resultado final.
+        queue_wait: segundos entre entrar na fila e a primeira transmissão (None se nunca transmitida).
+        """
+        future = Future()
+
+        def on_done(msg, status):
+            finished_at = time.time()
+            enqueued_at = msg.get('enqueued_at', finished_at)
+            first_sent_at = msg.get('first_sent_at')
+            future.set_result({
+                'dest': msg['dest'],
+                'status': status,
+                'attempts': msg.get('transmissions', 0),
+                'latency': finished_at - enqueued_at,
+                'queue_wait': first_sent_at - enqueued_at if first_sent_at is not None else None,
+            })
+
+        return {'dest': dest, 'content': content, 'attempts': 0, 'on_done': on_done}, future
+
+    def send(self, dest, content):
+        # Enfileira a mensagem e retorna um concurrent.futures.Future com o resultado da entrega
+        message, future = self.tracked_message(dest, content)
+        if not self.enqueue_message(message):
+            self.finish_message(message, "filacheia")
+        return future
+
+    async def send_async(self, dest, content):
+        # Versão para asyncio de send(): aguarda o resultado da entrega sem bloquear o loop de eventos
+        return await asyncio.wrap_future(self.send(dest, content))
+
+    def handle_command(self, line):
+        # Executa um comando de controle (iniciado por '/') e retorna o texto de saída;
+        # retorna None se a linha não for um comando conhecido e lança ValueError se os argumentos forem inválidos
+        # Comando: /forcartoken
+        if line == "/forcartoken":
+            with self.state_lock:
+                if not self.token_holder:
+                    self.token_holder = True
+                    logging.info(f"[{self.nickname}] Comando manual: forçando token.")
+                    self.send_token()
+            return ""
+
+        # Comando: /removertoken
+        if line == "/removertoken":
+            with self.state_lock:
+                self.token_holder = False
+            logging.info(f"[{self.nickname}] Comando manual: removendo token (não será passado).")
+            return ""
+
+        # Comando: /limparfila
+        if line == "/limparfila":
+            with self.state_lock:
+                removidas = []
+                while not self.message_queue.is_empty():
+                    removidas.append(self.message_queue.dequeue())
+            for msg in removidas:
+                self.finish_message(msg, "descartada")
+            logging.info(f"[{self.nickname}] Comando manual: limpando fila de mensagens.")
+            return f"[{self.nickname}] Fila de mensagens limpa."
+
+        if line == "/debug":
+            tempo_desde_token = time.time() - self.last_token_time if self.last_token_time else "nunca"
+            return "\n".join([
+                f"[{self.nickname}] STATUS DEBUG",
+                f"  Possui token? {'Sim' if self.token_holder else 'Não'}",
+                f"  Aguardando ACK/NAK? {'Sim' if self.waiting_for_answer else 'Não'}",
+                f"  Último token visto há: {tempo_desde_token} segundos",
+            ])
+
+        if line == "/duplicartoken":
+            token = Packet.create_token()
+            self.send_raw(Packet.encode(token).encode('utf-8'), self.right_neighbor)
+            self.send_raw(Packet.encode(token).encode('utf-8'), self.right_neighbor)
+            logging.info(f"[{self.nickname}] Comando: token duplicado enviado.")
+            return ""
+
+        if line == "/statusanel":
+            return "\n".join([
+                f"[{self.nickname}] Status do anel:",
+                f"  Token: {'Sim' if self.token_holder else 'Não'}",
+                f"  Fila vazia: {'Sim' if self.message_queue.is_empty() else 'Não'}",
+                f"  Esperando resposta? {'Sim' if self.waiting_for_answer else 'Não'}",
+                f"  Anel operacional? {'Sim' if self.ring_ok else 'Não'}",
+            ])
+
+        if line == "/mostrafila":
+            with self.message_queue.queue.mutex:
+                fila = list(self.message_queue.queue.queue)
+            linhas = [f"[{self.nickname}] Fila atual:"]
+            for i, msg in enumerate(fila):
+                linhas.append(f"  {i+1}. Para {msg['dest']} – \"{msg['content']}\" (tentativas: {msg['attempts']})")
+            return "\n".join(linhas)
+
+        if line.startswith("/tempo "):
+            valor = line.split()[1]
             try:
-                # Aguarda até 1 segundo por entrada do usuário sem bloquear o restante do programa
-                ready, _, _ = select.select([sys.stdin], [], [], 1.0)
-                
-                # Se houver entrada disponível do usuário
-                if ready:
-                    # Lê a linha digitada pelo usuário e remove espaços em branco adicionais
-                    line = sys.stdin.readline().strip()
-                    # Comando: /forcartoken
-                    if line == "/forcartoken":
-                        if not self.token_holder:
-                            self.token_holder = True
-                            logging.info(f"[{self.nickname}] Comando manual: forçando token.")
-                            self.send_token()
-                        continue
-
-                    # Comando: /removertoken
-                    if line == "/removertoken":
-                        self.token_holder = False
-                        logging.info(f"[{self.nickname}] Comando manual: removendo token (não será passado).")
-                        continue
-
-                    # Comando: /limparfila
-                    if line == "/limparfila":
-                        while not self.message_queue.is_empty():
-                            self.message_queue.dequeue()
-                        print(f"[{self.nickname}] Fila de mensagens limpa.")
-                        logging.info(f"[{self.nickname}] Comando manual: limpando fila de mensagens.")
-                        continue
-
-                    if line == "/debug":
-                        tempo_desde_token = time.time() - self.last_token_time if self.last_token_time else "nunca"
-                        print(f"[{self.nickname}] STATUS DEBUG")
-                        print(f"  Possui token? {'Sim' if self.token_holder else 'Não'}")
-                        print(f"  Aguardando ACK/NAK? {'Sim' if self.waiting_for_answer else 'Não'}")
-                        print(f"  Último token visto há: {tempo_desde_token} segundos")
-                        continue
-
-                    if line == "/duplicartoken":
-                        token = Packet.create_token()
-                        self.socket.sendto(Packet.encode(token).encode('utf-8'), self.right_neighbor)
-                        self.socket.sendto(Packet.encode(token).encode('utf-8'), self.right_neighbor)
-                        logging.info(f"[{self.nickname}] Comando: token duplicado enviado.")
-                        continue
-
-                    if line == "/statusanel":
-                        print(f"[{self.nickname}] Status do anel:")
-                        print(f"  Token: {'Sim' if self.token_holder else 'Não'}")
-                        print(f"  Fila vazia: {'Sim' if self.message_queue.is_empty() else 'Não'}")
-                        print(f"  Esperando resposta? {'Sim' if self.waiting_for_answer else 'Não'}")
-                        continue
-
-
-                    if line == "/mostrafila":
-                        with self.message_queue.queue.mutex:
-                            fila = list(self.message_queue.queue.queue)
-                            print(f"[{self.nickname}] Fila atual:")
-                            for i, msg in enumerate(fila):
-                                print(f"  {i+1}. Para {msg['dest']} – \"{msg['content']}\" (tentativas: {msg['attempts']})")
-                        continue
-
-                    if line.startswith("/tempo "):
-                        try:
-                            novo_tempo = float(line.split()[1])
-                            self.token_hold_time = novo_tempo
-                            self.token_timeout = self.token_hold_time * 5
-                            self.min_token_time = self.token_hold_time * 2 + 0.5
-                            print(f"[{self.nickname}] Tempo do token ajustado para {novo_tempo} segundos.")
-                        except ValueError:
-                            print(f"[{self.nickname}] Valor inválido para tempo.")
-                        continue
-
-
-                    # Ignora linhas vazias
-                    if not line:
-                        continue
-                    
-                    # Divide a linha em duas partes: destino e mensagem
-                    parts = line.split(' ', 1)
-                    
-                    # Valida se a entrada contém ao menos duas partes (destinatário e mensagem)
-                    if len(parts) < 2:
-                        print(f"[{self.nickname}] Comando inválido. Use: <destino> <mensagem>")
-                        continue
-                    
-                    # Extrai destinatário e mensagem digitados pelo usuário
-                    dest, msg = parts[0], parts[1]
-                    
-                    # Tenta enfileirar a mensagem na fila de mensagens pendentes
-                    ok = self.message_queue.enqueue({'dest': dest, 'content': msg, 'attempts': 0})
-                    
-                    # Se a fila estiver cheia, informa o usuário
-                    if not ok:
-                        print(f"[{self.nickname}] Fila cheia. Não foi possível enfileirar.")
-                    # Se possuir o token e não estiver aguardando resposta, inicia envio imediatamente
-                    elif self.token_holder and not self.waiting_for_answer:
-                        print(f"[{self.nickname}] Possui token, enviando...")
-                        self.send_data()
-                        self.waiting_for_answer = True
-                        
-            except Exception as e:
-                # Trata e exibe erros inesperados durante a leitura de entrada do usuário
-                if self.running:
-                    print(f"[{self.nickname}] Erro no input do usuário: {e}")
+                novo_tempo = float(valor)
+            except ValueError:
+                novo_tempo = None
+            if novo_tempo is None or not novo_tempo >= 0:
+                raise ValueError(f"Valor inválido para tempo: {valor}")
+            self.token_hold_time = novo_tempo
+            self.token_timeout = self.token_hold_time * 5
+            self.min_token_time = self.token_hold_time * 2 + 0.5
+            return f"[{self.nickname}] Tempo do token ajustado para {novo_tempo} segundos."
+
+        return None
+
+    def status(self):
+        # Resumo do estado do nó (usado pela interface de controle)
+        return {
+            'apelido': self.nickname,
+            'porta': self.port,
+            'vizinho': f"{self.right_neighbor[0]}:{self.right_neighbor[1]}",
+            'token': self.token_holder,
+            'aguardando_resposta': self.waiting_for_answer,
+            'anel_ok': self.ring_ok,
+            'fila': self.message_queue.size(),
+            'tempo_token': self.token_hold_time,
+            'ultimo_token_ha': time.time() - self.last_token_time if self.last_token_time else None,
+        }
 
     def shutdown(self):
         # Exibe mensagem indicando que o nó está sendo encerrado
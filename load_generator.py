@@ -0,0 +1,121 @@
+# load_generator.py
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+
+def load_workload(path):
+    """
+    Lê o arquivo de carga: uma linha por ação, no mesmo formato do terminal
+    ("<destino> <mensagem>" ou "/comando"). Linhas vazias e iniciadas por '#' são ignoradas.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+def build_requests(lines, batch_size):
+    """
+    Agrupa mensagens consecutivas em lotes JSON de até 'batch_size' itens.
+    Comandos (/...) e linhas sem mensagem são enviados individualmente, preservando a ordem.
+    Retorna uma lista de (linha_do_protocolo, quantidade_de_mensagens).
+    """
+    if batch_size <= 1:
+        return [(line, 0 if line.startswith('/') else 1) for line in lines]
+
+    requests = []
+    batch = []
+    for line in lines:
+        if line.startswith('/'):
+            if batch:
+                requests.append((json.dumps({'enviar': batch}, ensure_ascii=False), len(batch)))
+                batch = []
+            requests.append((line, 0))
+            continue
+        parts = line.split(' ', 1)
+
+        # Linha sem mensagem vai sozinha, como no modo sem lote (o nó a recusa e ela conta como recusada)
+        if len(parts) < 2:
+            if batch:
+                requests.append((json.dumps({'enviar': batch}, ensure_ascii=False), len(batch)))
+                batch = []
+            requests.append((line, 1))
+            continue
+
+        batch.append({'destino': parts[0], 'mensagem': parts[1]})
+        if len(batch) == batch_size:
+            requests.append((json.dumps({'enviar': batch}, ensure_ascii=False), len(batch)))
+            batch = []
+    if batch:
+        requests.append((json.dumps({'enviar': batch}, ensure_ascii=False), len(batch)))
+    return requests
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para a interface de controle de um nó do anel.")
+    parser.add_argument('porta', type=int, help="porta da interface de controle do nó (--controle)")
+    parser.add_argument('arquivo', help="arquivo de carga (uma linha '<destino> <mensagem>' ou '/comando' por ação)")
+    parser.add_argument('--host', default='127.0.0.1', help="endereço da interface de controle (padrão: 127.0.0.1)")
+    parser.add_argument('--taxa', type=float, default=0, help="requisições por segundo (padrão: 0 = o mais rápido possível)")
+    parser.add_argument('--repeticoes', type=int, default=1, help="quantas vezes repetir o arquivo de carga")
+    parser.add_argument('--lote', type=int, default=1, help="mensagens por requisição em lote (padrão: 1 = uma linha por mensagem)")
+    parser.add_argument('--verboso', action='store_true', help="exibe cada resposta recebida")
+    args = parser.parse_args()
+
+    requests = build_requests(load_workload(args.arquivo), args.lote) * args.repeticoes
+    if not requests:
+        print("[Carga] Arquivo de carga vazio.")
+        sys.exit(1)
+
+    try:
+        conn = socket.create_connection((args.host, args.porta))
+    except Exception as e:
+        print(f"[Carga] Erro ao conectar em {args.host}:{args.porta}: {e}")
+        sys.exit(1)
+
+    totals = {'respostas': 0, 'aceitas': 0, 'recusadas': 0, 'erros': 0}
+
+    def read_responses():
+        # Cada requisição gera exatamente uma linha de resposta, na mesma ordem
+        with conn.makefile('r', encoding='utf-8') as reader:
+            for (line, count), raw in zip(requests, reader):
+                resposta = json.loads(raw)
+                totals['respostas'] += 1
+                if 'aceitas' in resposta:
+                    totals['aceitas'] += resposta['aceitas']
+                    totals['recusadas'] += resposta['recusadas']
+                elif count:
+                    totals['aceitas' if resposta['ok'] else 'recusadas'] += 1
+                elif not resposta['ok']:
+                    totals['erros'] += 1
+                if args.verboso:
+                    print(f"[Carga] {line} -> {raw.strip()}")
+
+    reader_thread = threading.Thread(target=read_responses, daemon=True)
+    reader_thread.start()
+
+    # Envia as requisições respeitando a taxa alvo (agendamento absoluto para não acumular atraso)
+    interval = 1.0 / args.taxa if args.taxa > 0 else 0
+    start = time.time()
+    with conn.makefile('w', encoding='utf-8') as writer:
+        for i, (line, _) in enumerate(requests):
+            if interval:
+                delay = start + i * interval - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            writer.write(line + "\n")
+            writer.flush()
+        sent_elapsed = time.time() - start
+
+        reader_thread.join()
+    elapsed = time.time() - start
+    conn.close()
+
+    total_msgs = sum(count for _, count in requests)
+    print(f"[Carga] {len(requests)} requisições ({total_msgs} mensagens) enviadas em {sent_elapsed:.2f}s "
+          f"({len(requests) / sent_elapsed if sent_elapsed else float('inf'):.1f} req/s)")
+    print(f"[Carga] Respostas: {totals['respostas']} em {elapsed:.2f}s — "
+          f"aceitas: {totals['aceitas']}, recusadas: {totals['recusadas']}, erros de comando: {totals['erros']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# replay_trace.py
+
+import argparse
+import contextlib
+import cProfile
+import logging
+import os
+import pstats
+import random
+import sys
+import time
+from RingNode import RingNode
+from Packet import Packet
+from CRC32 import CRC32
+from PacketCapture import PacketCapture
+
+class StageTimer:
+    """
+    Acumula o tempo gasto em cada estágio do processamento (chamadas e segundos).
+    """
+
+    def __init__(self):
+        self.totals = {}
+
+    def wrap(self, stage, func):
+        entry = self.totals.setdefault(stage, [0, 0.0])
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+        return timed
+
+    def report(self, frames):
+        print(f"{'Estágio':<16}{'Chamadas':>10}{'Total (ms)':>14}{'Média (µs)':>14}{'µs/quadro':>12}")
+        for stage, (calls, seconds) in self.totals.items():
+            media = seconds / calls * 1e6 if calls else 0
+            por_quadro = seconds / frames * 1e6 if frames else 0
+            print(f"{stage:<16}{calls:>10}{seconds * 1e3:>14.2f}{media:>14.2f}{por_quadro:>12.2f}")
+
+def instrument(node, timer):
+    """
+    Instala os ganchos de tempo nos estágios do nó: decodificação, CRC, fila, log e envio.
+    O envio é substituído por um descarte (nenhum quadro sai para a rede durante a reprodução).
+    """
+    Packet.decode = staticmethod(timer.wrap('decodificação', Packet.decode))
+    CRC32.calculate = staticmethod(timer.wrap('CRC', CRC32.calculate))
+    for name in ('enqueue', 'dequeue', 'peek', 'is_empty', 'size'):
+        setattr(node.message_queue, name, timer.wrap('fila', getattr(node.message_queue, name)))
+    logging.info = timer.wrap('log', logging.info)
+    node.send_raw = timer.wrap('envio', lambda data, addr: None)
+    node.handle_datagram = timer.wrap('total', node.handle_datagram)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduz uma captura pcap na lógica de recepção de um nó, o mais rápido possível, para profiling.")
+    parser.add_argument('captura', help="arquivo pcap gravado com --captura")
+    parser.add_argument('config', help="arquivo de configuração do nó cuja recepção será reproduzida")
+    parser.add_argument('porta', type=int, help="porta local do nó na captura (seleciona os quadros recebidos por ele)")
+    parser.add_argument('--repeticoes', type=int, default=1, help="quantas vezes reproduzir a captura")
+    parser.add_argument('--log', default='replay.log', help="arquivo de log do nó durante a reprodução (padrão: replay.log)")
+    parser.add_argument('--semente', type=int, help="semente do gerador aleatório (inserção de erros reproduzível)")
+    parser.add_argument('--sem-cprofile', action='store_true', help="desativa o cProfile (só medição por estágio)")
+    parser.add_argument('--salvar-perfil', help="grava as estatísticas do cProfile neste arquivo (.prof)")
+    parser.add_argument('--top', type=int, default=25, help="funções exibidas no relatório do cProfile")
+    args = parser.parse_args()
+
+    frames = [(src, data) for _, src, dst, data in PacketCapture.read(args.captura) if dst[1] == args.porta]
+    if not frames:
+        print(f"[Replay] Nenhum quadro recebido pela porta {args.porta} em {args.captura}.")
+        sys.exit(1)
+
+    if args.semente is not None:
+        random.seed(args.semente)
+
+    # Os logs da reprodução vão para um arquivo próprio (não mistura com o log real do nó)
+    logging.basicConfig(filename=args.log, level=logging.INFO, format='[%(asctime)s] %(message)s', datefmt='%H:%M:%S')
+
+    # Nó offline: mesma lógica de processamento, sem socket ligado nem threads
+    node = RingNode(args.config, args.porta, interactive=False, offline=True)
+    node.token_hold_time = 0  # sem espera ao repassar o token
+
+    timer = StageTimer()
+    instrument(node, timer)
+    profiler = None if args.sem_cprofile else cProfile.Profile()
+
+    # As mensagens de console do nó (CRC32, MessageQueue, ...) são descartadas durante a reprodução
+    errors = 0
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        for _ in range(args.repeticoes):
+            for src, data in frames:
+                try:
+                    node.handle_datagram(data, src)
+                except Exception:
+                    errors += 1
+        elapsed = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+
+    total = len(frames) * args.repeticoes
+    print(f"[Replay] {total} quadros reproduzidos em {elapsed:.3f}s ({total / elapsed:.0f} quadros/s), {errors} com erro")
+    timer.report(total)
+
+    if profiler:
+        print()
+        stats = pstats.Stats(profiler)
+        stats.sort_stats('cumulative').print_stats(args.top)
+        if args.salvar_perfil:
+            stats.dump_stats(args.salvar_perfil)
+            print(f"[Replay] Estatísticas do cProfile gravadas em {args.salvar_perfil}")
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,77 @@
 
 import time
 import sys
+import signal
 from RingNode import RingNode
+from DualRingNode import DualRingNode
+from BridgeNode import BridgeNode
+from ControlServer import ControlServer
+from PacketCapture import PacketCapture
+
+def pop_option(args, name, usage):
+    # Remove "<name> <valor>" da lista de argumentos e retorna o valor (ou None se ausente)
+    if name not in args:
+        return None
+    i = args.index(name)
+    if i + 1 >= len(args):
+        print(f"Uso: {name} {usage}")
+        sys.exit(1)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
 
 if __name__ == "__main__":
-    # Precisamos de 2 argumentos: <arquivo_config> <minha_porta>
-    if len(sys.argv) < 3:
-        print("Uso: python3 ring_network.py <arquivo_configuracao> <minha_porta>")
+    args = sys.argv[1:]
+
+    # Opcional em qualquer modo: --controle <porta> abre a interface de controle local (TCP em 127.0.0.1)
+    control_port = pop_option(args, "--controle", "<porta_de_controle>")
+    if control_port is not None and not control_port.isdigit():
+        print("Uso: --controle <porta_de_controle> (número da porta)")
         sys.exit(1)
 
-    config_file = sys.argv[1]
-    # A porta local (onde este nó vai dar bind) estará em sys.argv[2], lida dentro de RingNode
-    node = RingNode(config_file)
+    # Opcional em qualquer modo: --captura <arquivo.pcap> grava os quadros enviados/recebidos
+    capture_file = pop_option(args, "--captura", "<arquivo.pcap>")
+    capture = PacketCapture(capture_file) if capture_file else None
+
+    # SIGTERM encerra o nó como o Ctrl+C (sem perder os quadros ainda não gravados na captura)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
 
+    node = None
+    control = None
     try:
+        # Modo ponte: --ponte <config_anel_1> <porta_1> <config_anel_2> <porta_2> [...]
+        if args and args[0] == "--ponte":
+            specs = args[1:]
+            if len(specs) < 4 or len(specs) % 2 != 0:
+                print("Uso: python3 ring_network.py --ponte <config_anel_1> <porta_1> <config_anel_2> <porta_2> [...] [--controle <porta>] [--captura <arquivo.pcap>]")
+                sys.exit(1)
+            node = BridgeNode(list(zip(specs[0::2], specs[1::2])), capture=capture)
+
+        # Precisamos de 2 argumentos: <arquivo_config> <minha_porta>
+        # Opcionalmente mais 2 para o anel secundário: <arquivo_config_secundario> <porta_secundaria>
+        elif len(args) not in (2, 4):
+            print("Uso: python3 ring_network.py <arquivo_configuracao> <minha_porta> [<arquivo_config_secundario> <porta_secundaria>] [--controle <porta>] [--captura <arquivo.pcap>]")
+            sys.exit(1)
+
+        elif len(args) == 4:
+            # Modo anel duplo: um anel em cada sentido, cada um com seu próprio token
+            node = DualRingNode(args[0], args[1], args[2], args[3], capture=capture)
+        else:
+            node = RingNode(args[0], args[1], capture=capture)
+
+        control = ControlServer(node, control_port) if control_port else None
+
         # Mantém o programa vivo para que as threads daemon continuem rodando
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
-        # Ctrl+C → encerra nó limpamente
-        node.shutdown()
+        # Ctrl+C (ou SIGTERM) → encerra nó limpamente
+        if control:
+            control.shutdown()
+        if node:
+            node.shutdown()
         print("\nNó encerrado com sucesso.")
+    finally:
+        # Grava os quadros ainda pendentes em qualquer saída (inclusive sys.exit durante a inicialização)
+        if capture:
+            capture.close()